@@ -1,10 +1,32 @@
 import argparse
+import subprocess
 import sys
-import os
 from typing import Optional
 
 from .core import GitViz
 
+# Single source of truth for the format <-> engine mapping; validation
+# becomes O(1) dict lookups instead of per-invocation if-chains.
+FORMAT_TO_ENGINE = {
+    "html": "pyvis",
+    "png": "matplotlib",
+    "svg": "matplotlib",
+    "pdf": "matplotlib",
+    "jpg": "matplotlib",
+    "jpeg": "matplotlib",
+    "txt": "ascii",
+    "ascii": "ascii",
+    "dot": "dot",
+}
+
+ENGINE_FORMATS = {
+    "pyvis": {"html"},
+    "sigma": {"html"},
+    "matplotlib": {"png", "svg", "pdf", "jpg", "jpeg"},
+    "ascii": {"txt", "ascii"},
+    "dot": {"dot"},
+}
+
 
 def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -20,14 +42,14 @@ def create_parser() -> argparse.ArgumentParser:
     
     parser.add_argument(
         "--engine",
-        choices=["pyvis", "matplotlib", "ascii", "auto"],
+        choices=["pyvis", "sigma", "matplotlib", "ascii", "dot", "auto"],
         default="auto",
         help="Rendering engine to use (default: auto)"
     )
     
     parser.add_argument(
         "--format",
-        choices=["html", "png", "svg", "pdf", "jpg", "jpeg", "txt", "ascii"],
+        choices=["html", "png", "svg", "pdf", "jpg", "jpeg", "txt", "ascii", "dot"],
         default="html",
         help="Output format (default: html)"
     )
@@ -45,6 +67,36 @@ def create_parser() -> argparse.ArgumentParser:
         help="Maximum number of commits to include (default: 100)"
     )
     
+    parser.add_argument(
+        "--refs",
+        default="HEAD",
+        help="Refs to walk: a revision like HEAD or a branch name, or 'all' for every branch and tag (default: HEAD)"
+    )
+
+    parser.add_argument(
+        "--first-parent",
+        action="store_true",
+        help="Follow only the first parent of merge commits (faster on merge-heavy histories)"
+    )
+
+    parser.add_argument(
+        "--prune-orphans",
+        action="store_true",
+        help="Drop commits left fully disconnected by the --max-commits window"
+    )
+
+    parser.add_argument(
+        "--collapse-linear",
+        action="store_true",
+        help="Contract linear runs of commits into single hops for a smaller graph"
+    )
+
+    parser.add_argument(
+        "--build-commit-graph",
+        action="store_true",
+        help="Build git's commit-graph file before reading the log (speeds up large repositories)"
+    )
+
     parser.add_argument(
         "--list-engines",
         action="store_true",
@@ -61,39 +113,24 @@ def create_parser() -> argparse.ArgumentParser:
 
 
 def validate_args(args: argparse.Namespace) -> None:
-    # Check if repository path exists
-    if not os.path.exists(args.path):
-        print(f"Error: Repository path does not exist: {args.path}", file=sys.stderr)
-        sys.exit(1)
-    
+    # Missing/invalid repository paths are diagnosed by GitRepository,
+    # so no separate existence check is needed here
+
     # Validate max commits
     if args.max_commits <= 0:
         print("Error: --max-commits must be a positive integer", file=sys.stderr)
         sys.exit(1)
     
-    # Auto-select engine based on format if needed
+    # "auto" is resolved in core once the commit count is known, so the
+    # HTML path can pick the WebGL renderer for very large graphs
     if args.engine == "auto":
-        if args.format in ["html"]:
-            args.engine = "pyvis"
-        elif args.format in ["png", "svg", "pdf", "jpg", "jpeg"]:
-            args.engine = "matplotlib"
-        elif args.format in ["txt", "ascii"]:
-            args.engine = "ascii"
-        else:
-            args.engine = "pyvis"  # fallback
-    
-    # Format-specific validations
-    if args.format == "html" and args.engine != "pyvis":
-        print("Warning: HTML format requires PyVis engine, switching to 'pyvis'")
-        args.engine = "pyvis"
-    
-    if args.format in ["png", "svg", "pdf", "jpg", "jpeg"] and args.engine not in ["matplotlib"]:
-        print(f"Warning: {args.format} format requires matplotlib engine, switching to 'matplotlib'")
-        args.engine = "matplotlib"
-    
-    if args.format in ["txt", "ascii"] and args.engine not in ["ascii"]:
-        print(f"Warning: {args.format} format requires ascii engine, switching to 'ascii'")
-        args.engine = "ascii"
+        return
+
+    # Format-specific validation: switch to the engine that owns the format
+    if args.format not in ENGINE_FORMATS[args.engine]:
+        required = FORMAT_TO_ENGINE[args.format]
+        print(f"Warning: {args.format} format requires {required} engine, switching to '{required}'")
+        args.engine = required
 
 
 def list_engines() -> None:
@@ -118,6 +155,16 @@ def list_engines() -> None:
             'description': 'Terminal-based text visualizations',
             'formats': ['txt', 'ascii'],
             'install': 'No dependencies required'
+        },
+        'dot': {
+            'description': 'Graphviz DOT source for external toolchains',
+            'formats': ['dot'],
+            'install': 'No dependencies required'
+        },
+        'sigma': {
+            'description': 'WebGL HTML visualizations for very large graphs',
+            'formats': ['html'],
+            'install': 'No dependencies required'
         }
     }
     
@@ -131,9 +178,12 @@ def list_engines() -> None:
         print()
 
 
-def main() -> None:
+def main(argv: Optional[list] = None) -> None:
+    # argv=None reads sys.argv as usual; passing a list lets callers
+    # (tests, embedding scripts) drive the CLI without mutating global
+    # state, which keeps concurrent in-process invocations safe
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Handle special commands
     if args.list_engines:
@@ -144,6 +194,15 @@ def main() -> None:
     validate_args(args)
     
     try:
+        # Optionally build the commit-graph file so git can walk the
+        # history without parsing raw commit objects
+        if args.build_commit_graph:
+            subprocess.run(
+                ["git", "commit-graph", "write", "--reachable", "--changed-paths"],
+                cwd=args.path,
+                check=False
+            )
+
         # Create GitViz instance and generate visualization
         gitviz = GitViz()
         
@@ -160,7 +219,11 @@ def main() -> None:
             engine=args.engine,
             output_path=args.output,
             format_type=args.format,
-            max_commits=args.max_commits
+            max_commits=args.max_commits,
+            refs=args.refs,
+            first_parent=args.first_parent,
+            prune_orphans=args.prune_orphans,
+            collapse_linear=args.collapse_linear
         )
         
     except KeyboardInterrupt:
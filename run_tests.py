@@ -3,6 +3,7 @@
 Test runner for GitViz
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
@@ -27,9 +28,12 @@ def run_tests():
     # Run unit tests if pytest is available
     print("\nRunning unit tests...")
     try:
-        result = subprocess.run([
-            sys.executable, "-m", "pytest", "tests/test_engines.py", "-v"
-        ], check=True)
+        # Engine tests are independent and subprocess/IO bound: spread
+        # them across workers when pytest-xdist is installed
+        pytest_cmd = [sys.executable, "-m", "pytest", "tests/test_engines.py", "-v"]
+        if importlib.util.find_spec("xdist") is not None:
+            pytest_cmd += ["-n", "auto"]
+        result = subprocess.run(pytest_cmd, check=True)
         print("✓ Unit tests passed")
     except (subprocess.CalledProcessError, FileNotFoundError):
         print("⚠ Unit tests skipped (pytest not available)")
@@ -1,4 +1,6 @@
+import io
 import os
+import shlex
 import sys
 import tempfile
 import subprocess
@@ -21,90 +23,123 @@ def create_test_repo(repo_path):
     print(f"Creating test repository at {repo_path}")
     
     os.makedirs(repo_path, exist_ok=True)
-    original_cwd = os.getcwd()
-    
+
+    def run_stage(*commands):
+        # One shell per logical stage: chaining with && collapses ~20
+        # fork/exec round-trips into a handful, which dominates fixture
+        # wall time far more than any of the git work itself.
+        # stdout goes straight to /dev/null in the kernel (nothing ever
+        # reads it); stderr is piped only because it carries the
+        # diagnostics printed on failure. cwd= scopes the commands to
+        # the repo without touching the process-global working directory.
+        script = " && ".join(
+            " ".join(shlex.quote(arg) for arg in command)
+            for command in commands
+        )
+        subprocess.run(script, shell=True, check=True, cwd=repo_path,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    # Build the whole history as a git fast-import stream: one long-lived
+    # plumbing subprocess ingests every blob and commit through a single
+    # pipe, replacing the ~20 porcelain add/commit/branch/merge calls
+    # that dominated fixture wall time. Only the topology matters to the
+    # tests, so no working-tree checkouts are needed.
+    stream = io.BytesIO()
+    marks = {}
+
+    def blob(mark, content):
+        raw = content.encode("utf-8")
+        stream.write(b"blob\nmark :%d\ndata %d\n" % (mark, len(raw)))
+        stream.write(raw)
+        stream.write(b"\n")
+
+    def commit(mark, ref, message, files, merge=None, from_mark=None):
+        raw = message.encode("utf-8")
+        stream.write(b"commit refs/heads/%s\nmark :%d\n" % (ref.encode(), mark))
+        stream.write(b"committer Test User <test@example.com> %d +0000\n"
+                     % (1700000000 + mark * 60))
+        stream.write(b"data %d\n" % len(raw))
+        stream.write(raw)
+        stream.write(b"\n")
+        if from_mark is not None:
+            stream.write(b"from :%d\n" % from_mark)
+        if merge is not None:
+            stream.write(b"merge :%d\n" % merge)
+        for path, blob_mark in files:
+            stream.write(b"M 100644 :%d %s\n" % (blob_mark, path.encode()))
+        marks[ref] = mark
+
     try:
-        os.chdir(repo_path)
-        
-        # Initialize repository
-        subprocess.run(["git", "init"], check=True, capture_output=True)
-        subprocess.run(["git", "config", "user.name", "Test User"], check=True)
-        subprocess.run(["git", "config", "user.email", "test@example.com"], check=True)
-        
-        # Create initial commit
-        with open("README.md", "w") as f:
-            f.write("# Test Repository\n\nThis is a test repository for Gitviz.\n")
-        subprocess.run(["git", "add", "README.md"], check=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit"], check=True)
-        
-        # Create some files and commits
+        # --initial-branch pins the branch name regardless of host
+        # config (no symbolic-ref fixup, no rename hint formatting),
+        # and --quiet skips the greeting nobody reads
+        # The fixture is throwaway, so durability guarantees are waste:
+        # skipping fsync and auto-gc removes the journaling stalls that
+        # otherwise dominate a burst of object writes
+        run_stage(
+            ["git", "init", "--quiet", "--initial-branch=main"],
+            ["git", "config", "user.name", "Test User"],
+            ["git", "config", "user.email", "test@example.com"],
+            ["git", "config", "core.fsync", "none"],
+            ["git", "config", "core.fsyncObjectFiles", "false"],
+            ["git", "config", "gc.auto", "0"],
+        )
+
         files_and_messages = [
+            ("README.md", "# Test Repository\n\nThis is a test repository for Gitviz.\n", "Initial commit"),
             ("src/main.py", "def main():\n    print('Hello, World!')\n", "Add main.py"),
             ("src/__init__.py", "", "Add __init__.py"),
             ("tests/test_main.py", "def test_main():\n    assert True\n", "Add tests"),
             ("setup.py", "from setuptools import setup\n", "Add setup.py"),
             ("requirements.txt", "pytest\nblack\n", "Add requirements"),
         ]
-        
+
+        # Blobs first, then the linear run of commits on main
+        mark = 0
+        linear = []
         for filepath, content, message in files_and_messages:
-            # only mkdir if there’s a non-empty directory path
-            dirpath = os.path.dirname(filepath)
-            if dirpath:
-                os.makedirs(dirpath, exist_ok=True)
-            with open(filepath, "w") as f:
-                f.write(content)
-            subprocess.run(["git", "add", filepath], check=True)
-            subprocess.run(["git", "commit", "-m", message], check=True)
-        
-        # Create a feature branch
-        subprocess.run(["git", "branch", "feature/new-feature"], check=True)
-        subprocess.run(["git", "checkout", "feature/new-feature"], check=True)
-        
-        # Make commits on feature branch
-        with open("src/feature.py", "w") as f:
-            f.write("def new_feature():\n    return 'New feature!'\n")
-        subprocess.run(["git", "add", "src/feature.py"], check=True)
-        subprocess.run(["git", "commit", "-m", "Implement new feature"], check=True)
-        
-        with open("src/feature.py", "w") as f:
-            f.write("def new_feature():\n    return 'Improved feature!'\n")
-        subprocess.run(["git", "add", "src/feature.py"], check=True)
-        subprocess.run(["git", "commit", "-m", "Improve new feature"], check=True)
-        
-        # Switch back to main and create another commit
-        subprocess.run(["git", "checkout", "main"], check=True)
-        os.makedirs("docs", exist_ok=True)
-        with open("docs/README.md", "w") as f:
-            f.write("# Documentation\n\nProject documentation.\n")
-        subprocess.run(["git", "add", "docs/README.md"], check=True)
-        subprocess.run(["git", "commit", "-m", "Add documentation"], check=True)
-        
-        # Merge the feature branch
-        subprocess.run(["git", "merge", "feature/new-feature", "--no-ff", "-m", "Merge feature branch"], check=True)
-        
-        # Create a hotfix
-        subprocess.run(["git", "branch", "hotfix/critical-fix"], check=True)
-        subprocess.run(["git", "checkout", "hotfix/critical-fix"], check=True)
-        
-        with open("src/main.py", "w") as f:
-            f.write("def main():\n    print('Hello, Fixed World!')\n")
-        subprocess.run(["git", "add", "src/main.py"], check=True)
-        subprocess.run(["git", "commit", "-m", "Critical hotfix"], check=True)
-        
-        subprocess.run(["git", "checkout", "main"], check=True)
-        subprocess.run(["git", "merge", "hotfix/critical-fix", "--no-ff", "-m", "Merge hotfix"], check=True)
-        
+            mark += 1
+            blob(mark, content)
+            linear.append((filepath, message, mark))
+        blob(101, "def new_feature():\n    return 'New feature!'\n")
+        blob(102, "def new_feature():\n    return 'Improved feature!'\n")
+        blob(103, "# Documentation\n\nProject documentation.\n")
+        blob(104, "def main():\n    print('Hello, Fixed World!')\n")
+
+        for filepath, message, blob_mark in linear:
+            mark += 1
+            commit(mark, "main", message, [(filepath, blob_mark)])
+
+        # Feature branch with two commits, branched from main's tip
+        commit(201, "feature/new-feature", "Implement new feature",
+               [("src/feature.py", 101)], from_mark=marks["main"])
+        commit(202, "feature/new-feature", "Improve new feature",
+               [("src/feature.py", 102)])
+
+        # Docs commit on main, then the feature merge
+        commit(203, "main", "Add documentation", [("docs/README.md", 103)])
+        commit(204, "main", "Merge feature branch", [], merge=202)
+
+        # Hotfix branch and merge back
+        commit(205, "hotfix/critical-fix", "Critical hotfix",
+               [("src/main.py", 104)], from_mark=marks["main"])
+        commit(206, "main", "Merge hotfix", [], merge=205)
+
+        subprocess.run(
+            ["git", "-C", repo_path, "fast-import", "--quiet"],
+            input=stream.getvalue(), check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
         print("Test repository created successfully")
         
     except subprocess.CalledProcessError as e:
-        print(f"Error creating test repository: {e}")
+        stderr = e.stderr.decode(errors="replace") if e.stderr else ""
+        print(f"Error creating test repository: {e}\n{stderr}")
         return False
     except Exception as e:
         print(f"Unexpected error: {e}")
         return False
-    finally:
-        os.chdir(original_cwd)
-    
+
     return True
 
 
@@ -115,7 +150,7 @@ def test_core_functionality(repo_path):
         # Test GitRepository
         print("Testing GitRepository...")
         repo = GitRepository(repo_path)
-        commits = repo.get_commits()
+        commits = list(repo.get_commits())
         print(f"Found {len(commits)} commits")
         
         if commits:
@@ -194,7 +229,34 @@ def test_rendering_engines(repo_path, output_dir):
                 
         except Exception as e:
             print(f"  Error with {engine}/{format_type}: {e}")
-    
+
+    # Static formats share one graph: render_many builds the figure once
+    # and saves it per format instead of re-laying-out for each
+    if "matplotlib" in available_engines:
+        total_tests += 1
+        formats = ["png", "svg", "pdf"]
+        try:
+            print(f"Testing matplotlib engine with formats {', '.join(formats)}...")
+            output_path = os.path.join(output_dir, "matplotlib_output")
+            commits = list(GitRepository(repo_path).get_commits(20))
+            gitviz.engines["matplotlib"].render_many(commits, output_path, formats)
+
+            files_created = []
+            for fmt in formats:
+                expected_file = f"{output_path}.{fmt}"
+                if os.path.exists(expected_file):
+                    files_created.append(expected_file)
+                    size = os.path.getsize(expected_file)
+                    print(f"  Created {os.path.basename(expected_file)} ({size} bytes)")
+
+            if len(files_created) == len(formats):
+                success_count += 1
+            else:
+                print("  Some output files missing")
+
+        except Exception as e:
+            print(f"  Error with matplotlib/render_many: {e}")
+
     print(f"\nSuccessfully tested {success_count}/{total_tests} configurations")
     return success_count > 0
 
@@ -240,9 +302,28 @@ def test_cli_interface(repo_path, output_dir):
 
 
 def main_test():
+    # The suite emits hundreds of prints; with line buffering each one
+    # pays a lock acquire and (when redirected) a flush. Swap in a
+    # block-buffered wrapper for the duration and flush once per run.
+    original_stdout = sys.stdout
+    buffered = None
+    if hasattr(sys.stdout, "buffer"):
+        buffered = io.TextIOWrapper(
+            sys.stdout.buffer, line_buffering=False, write_through=False)
+        sys.stdout = buffered
+    try:
+        return _run_test_suite()
+    finally:
+        if buffered is not None:
+            buffered.flush()
+            buffered.detach()
+            sys.stdout = original_stdout
+
+
+def _run_test_suite():
     print("Gitviz Manual Test Suite")
     print("=" * 50)
-    
+
     # Create temporary directory for testing
     with tempfile.TemporaryDirectory() as temp_dir:
         repo_path = os.path.join(temp_dir, "test_repo")
@@ -253,7 +334,8 @@ def main_test():
         
         # Check if git is available
         try:
-            subprocess.run(["git", "--version"], check=True, capture_output=True)
+            subprocess.run(["git", "--version"], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except (subprocess.CalledProcessError, FileNotFoundError):
             print("Git is not available. Please install Git to run tests.")
             return False
@@ -277,32 +359,48 @@ def main_test():
         
         # Summary
         print("\n" + "=" * 50)
-        
+
+        # scandir's DirEntry objects carry cached stat info, so listing
+        # names and sizes costs roughly half the syscalls of
+        # os.walk + os.path.getsize per file
+        def iter_outputs(directory):
+            for entry in os.scandir(directory):
+                if entry.is_dir():
+                    yield from iter_outputs(entry.path)
+                else:
+                    yield entry
+
+        have_outputs = False
         if tests_passed == total_tests:
             print("All tests passed.")
-            
+
             # List output files
-            output_files = []
-            for root, dirs, files in os.walk(output_dir):
-                for file in files:
-                    output_files.append(os.path.join(root, file))
-            
-            if output_files:
-                print(f"\n Generated {len(output_files)} output files:")
-                for file in output_files:
-                    rel_path = os.path.relpath(file, output_dir)
-                    size = os.path.getsize(file)
-                    print(f"  - {rel_path} ({size} bytes)")
-                    
+            count = 0
+            for entry in iter_outputs(output_dir):
+                if not have_outputs:
+                    print("\n Generated output files:")
+                    have_outputs = True
+                count += 1
+                rel_path = os.path.relpath(entry.path, output_dir)
+                print(f"  - {rel_path} ({entry.stat().st_size} bytes)")
+            if have_outputs:
+                print(f" Total: {count} files")
+
         else:
             print("Some tests failed.")
-        
-        # Keep output directory for inspection
-        if output_files:
+
+        # Keep output directory for inspection. The temp dir is about to
+        # be deleted anyway, so a same-filesystem rename moves the whole
+        # tree with one directory-entry update instead of recopying every
+        # rendered file; copytree remains the cross-device fallback.
+        if have_outputs:
             final_output_dir = os.path.join(os.getcwd(), "gitviz_test_output")
             if os.path.exists(final_output_dir):
                 shutil.rmtree(final_output_dir)
-            shutil.copytree(output_dir, final_output_dir)
+            try:
+                os.rename(output_dir, final_output_dir)
+            except OSError:
+                shutil.copytree(output_dir, final_output_dir)
             print(f"\n Test outputs copied to: {final_output_dir}")
         
         return tests_passed == total_tests
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the GitViz test suite
+"""
+
+import subprocess
+
+import pytest
+
+
+def build_sample_repo(repo_path):
+    """Create a small git repository with branches and merges at repo_path.
+
+    The entire history is ingested through one git fast-import stream, so
+    building the fixture costs two subprocess calls regardless of how
+    many commits it contains.
+    """
+    # Throwaway fixture: skip fsync and auto-gc so object writes never
+    # stall on the journal
+    commands = [
+        ["git", "-C", repo_path, "init", "--quiet", "--initial-branch=main"],
+        ["git", "-C", repo_path, "config", "user.name", "Test User"],
+        ["git", "-C", repo_path, "config", "user.email", "test@example.com"],
+        ["git", "-C", repo_path, "config", "core.fsync", "none"],
+        ["git", "-C", repo_path, "config", "core.fsyncObjectFiles", "false"],
+        ["git", "-C", repo_path, "config", "gc.auto", "0"],
+    ]
+    for command in commands:
+        subprocess.run(command, check=True, capture_output=True)
+
+    parts = []
+    marks = {}
+    next_mark = [0]
+
+    def blob(content):
+        raw = content.encode("utf-8")
+        next_mark[0] += 1
+        parts.append(b"blob\nmark :%d\ndata %d\n%s\n" % (next_mark[0], len(raw), raw))
+        return next_mark[0]
+
+    def commit(ref, message, files, merge=None, from_ref=None):
+        raw = message.encode("utf-8")
+        next_mark[0] += 1
+        mark = next_mark[0]
+        lines = [b"commit refs/heads/%s\nmark :%d\n" % (ref.encode(), mark),
+                 b"committer Test User <test@example.com> %d +0000\n"
+                 % (1700000000 + mark * 60),
+                 b"data %d\n%s\n" % (len(raw), raw)]
+        if from_ref is not None:
+            lines.append(b"from :%d\n" % marks[from_ref])
+        if merge is not None:
+            lines.append(b"merge :%d\n" % marks[merge])
+        for path, blob_mark in files:
+            lines.append(b"M 100644 :%d %s\n" % (blob_mark, path.encode()))
+        parts.extend(lines)
+        marks[ref] = mark
+        return mark
+
+    readme = blob("# Test Repository\n")
+    feature = blob("def new_feature():\n    return 'New feature!'\n")
+    docs = blob("# Documentation\n")
+    fix = blob("def main():\n    print('Fixed')\n")
+
+    commit("main", "Initial commit", [("README.md", readme)])
+    commit("main", "Add main.py", [("src/main.py", fix)])
+    commit("feature/new-feature", "Implement new feature",
+           [("src/feature.py", feature)], from_ref="main")
+    commit("main", "Add documentation", [("docs/README.md", docs)])
+    marks["feature-tip"] = marks["feature/new-feature"]
+    commit("main", "Merge feature branch", [], merge="feature-tip")
+
+    subprocess.run(
+        ["git", "-C", repo_path, "fast-import", "--quiet"],
+        input=b"".join(parts), check=True, capture_output=True)
+
+
+@pytest.fixture(scope="session")
+def sample_repo(tmp_path_factory):
+    """A git repository with branches and merges, built once per session."""
+    repo_path = tmp_path_factory.mktemp("gitviz-fixture") / "repo"
+    repo_path.mkdir()
+    build_sample_repo(str(repo_path))
+    return str(repo_path)
@@ -3,96 +3,118 @@
 Integration tests for GitViz CLI
 """
 
+import concurrent.futures
 import subprocess
 import os
 import tempfile
 import shutil
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gitviz.cli import main as cli_main
+
+
+def run_cli(*args):
+    """Drive gitviz.cli.main in-process and return its exit code.
+
+    Spawning sys.executable per test case costs ~100-300ms of
+    interpreter start-up, which dwarfs the actual CLI work; only one
+    real-subprocess smoke test is kept to confirm the __main__ wiring.
+    Arguments are passed straight to main() rather than via sys.argv,
+    so concurrent invocations never race on global state.
+    """
+    try:
+        cli_main(list(args))
+        return 0
+    except SystemExit as e:
+        return e.code if e.code is not None else 0
+
 
 def test_cli_list_engines():
-    """Test that CLI can list engines"""
+    """Smoke test the real `python -m gitviz.cli` entry point"""
+    # Stream stdout line by line instead of buffering the whole output:
+    # the assertions are satisfied within the first few lines, so the
+    # child can be torn down as soon as both markers have been seen
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gitviz.cli", "--list-engines"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
     try:
-        result = subprocess.run([
-            sys.executable, "-m", "gitviz.cli", "--list-engines"
-        ], capture_output=True, text=True, check=True)
-        
-        output = result.stdout
-        assert "Available rendering engines:" in output
-        assert "ascii" in output
-        print("✓ CLI list engines test passed")
-        
-    except subprocess.CalledProcessError as e:
-        print(f"✗ CLI list engines test failed: {e}")
-        print(f"stdout: {e.stdout}")
-        print(f"stderr: {e.stderr}")
-
-
-def test_cli_ascii_engine():
+        saw_header = saw_ascii = False
+        for line in proc.stdout:
+            saw_header = saw_header or "Available rendering engines:" in line
+            saw_ascii = saw_ascii or "ascii" in line
+            if saw_header and saw_ascii:
+                proc.terminate()
+                break
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+    assert saw_header, "Engine listing header not printed"
+    assert saw_ascii, "ascii engine missing from listing"
+    print("✓ CLI list engines test passed")
+
+
+def test_cli_ascii_engine(sample_repo):
     """Test CLI with ASCII engine"""
     temp_dir = tempfile.mkdtemp()
     try:
         output_path = os.path.join(temp_dir, "cli_test_ascii")
-        
-        result = subprocess.run([
-            sys.executable, "-m", "gitviz.cli",
+
+        exit_code = run_cli(
+            "--path", sample_repo,
             "--engine", "ascii",
             "--format", "txt",
             "--output", output_path,
             "--max-commits", "3"
-        ], capture_output=True, text=True, check=True)
-        
+        )
+        assert exit_code == 0, f"CLI exited with code {exit_code}"
+
         # Check that output file was created
         expected_file = output_path + '.txt'
         assert os.path.exists(expected_file), f"Expected file {expected_file} was not created"
-        
+
         # Check file content
         with open(expected_file, 'r', encoding='utf-8') as f:
             content = f.read()
             assert "Git Repository Visualization (ASCII)" in content
-        
+
         print("✓ CLI ASCII engine test passed")
-        
-    except subprocess.CalledProcessError as e:
-        print(f"✗ CLI ASCII engine test failed: {e}")
-        print(f"stdout: {e.stdout}")
-        print(f"stderr: {e.stderr}")
+
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
-def test_cli_matplotlib_engine():
+def test_cli_matplotlib_engine(sample_repo):
     """Test CLI with Matplotlib engine"""
     temp_dir = tempfile.mkdtemp()
     try:
         output_path = os.path.join(temp_dir, "cli_test_matplotlib")
-        
-        result = subprocess.run([
-            sys.executable, "-m", "gitviz.cli",
+
+        exit_code = run_cli(
+            "--path", sample_repo,
             "--engine", "matplotlib",
             "--format", "png",
             "--output", output_path,
             "--max-commits", "3"
-        ], capture_output=True, text=True, check=True)
-        
+        )
+        assert exit_code == 0, f"CLI exited with code {exit_code}"
+
         # Check that output file was created
         expected_file = output_path + '.png'
         assert os.path.exists(expected_file), f"Expected file {expected_file} was not created"
-        
+
         # Check file size
         assert os.path.getsize(expected_file) > 0, "Generated PNG file is empty"
-        
+
         print("✓ CLI Matplotlib engine test passed")
-        
-    except subprocess.CalledProcessError as e:
-        print(f"✗ CLI Matplotlib engine test failed: {e}")
-        print(f"stdout: {e.stdout}")
-        print(f"stderr: {e.stderr}")
+
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
-def test_cli_auto_engine_selection():
+def test_cli_auto_engine_selection(sample_repo):
     """Test CLI auto engine selection"""
     temp_dir = tempfile.mkdtemp()
     try:
@@ -101,58 +123,66 @@ def test_cli_auto_engine_selection():
             ("txt", "ascii"),
             ("png", "matplotlib"),
         ]
-        
+
         for format_type, expected_engine in test_cases:
             output_path = os.path.join(temp_dir, f"cli_auto_{format_type}")
-            
-            result = subprocess.run([
-                sys.executable, "-m", "gitviz.cli",
+
+            exit_code = run_cli(
+                "--path", sample_repo,
                 "--engine", "auto",
                 "--format", format_type,
                 "--output", output_path,
                 "--max-commits", "2"
-            ], capture_output=True, text=True, check=True)
-            
-            # Check that output was generated
-            output_files = [f for f in os.listdir(temp_dir) if f.startswith(f"cli_auto_{format_type}")]
-            assert len(output_files) > 0, f"No output files generated for {format_type}"
-        
+            )
+            assert exit_code == 0, f"CLI exited with code {exit_code}"
+
+            # The output filename is deterministic, so one stat beats
+            # re-listing and filtering the whole directory per iteration
+            expected_file = f"{output_path}.{format_type}"
+            assert os.path.exists(expected_file), f"Expected file {expected_file} was not created"
+
         print("✓ CLI auto engine selection test passed")
-        
-    except subprocess.CalledProcessError as e:
-        print(f"✗ CLI auto engine selection test failed: {e}")
-        print(f"stdout: {e.stdout}")
-        print(f"stderr: {e.stderr}")
+
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 def test_cli_validation():
     """Test CLI argument validation"""
-    # Test invalid engine
-    try:
-        result = subprocess.run([
-            sys.executable, "-m", "gitviz.cli",
-            "--engine", "nonexistent_engine",
-            "--output", "test"
-        ], capture_output=True, text=True)
-        
-        assert result.returncode != 0, "Should fail with invalid engine"
-        print("✓ CLI validation test passed")
-        
-    except Exception as e:
-        print(f"✗ CLI validation test failed: {e}")
+    # Test invalid engine: argparse rejects the choice and exits non-zero
+    exit_code = run_cli("--engine", "nonexistent_engine", "--output", "test")
+    assert exit_code != 0, "Should fail with invalid engine"
+    print("✓ CLI validation test passed")
 
 
 if __name__ == "__main__":
+    # Direct execution has no pytest to inject the session fixture, so
+    # build an equivalent throwaway repository here
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from conftest import build_sample_repo
+
     print("Running GitViz CLI integration tests...")
     print("=" * 50)
-    
-    test_cli_list_engines()
-    test_cli_ascii_engine()
-    test_cli_matplotlib_engine()
-    test_cli_auto_engine_selection()
-    test_cli_validation()
-    
+
+    repo_dir = tempfile.mkdtemp()
+    try:
+        build_sample_repo(repo_dir)
+
+        # The tests are independent and subprocess/IO bound, and each
+        # one writes into its own mkdtemp, so they can overlap; the
+        # wall clock is dominated by waiting, not Python
+        tests = [
+            test_cli_list_engines,
+            lambda: test_cli_ascii_engine(repo_dir),
+            lambda: test_cli_matplotlib_engine(repo_dir),
+            lambda: test_cli_auto_engine_selection(repo_dir),
+            test_cli_validation,
+        ]
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(4, len(tests))) as executor:
+            list(executor.map(lambda test: test(), tests))
+    finally:
+        shutil.rmtree(repo_dir, ignore_errors=True)
+
     print("=" * 50)
-    print("Integration tests completed!") 
\ No newline at end of file
+    print("Integration tests completed!")